@@ -1,31 +1,75 @@
 #!/usr/bin/env python3
-import argparse, time, random, sys, json, socket
+import argparse, asyncio, collections, functools, hashlib, re, threading, time, random, sys, json, socket
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from pathlib import Path
+try:
+    import httpx
+except ImportError:  # optional: thread-pool fallback covers user.status
+    httpx = None
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from http.cookiejar import MozillaCookieJar
 
 # Defaults (overridable via config)
 API_HOSTS = ["https://codeforces.com/api", "https://www.codeforces.com/api"]
 TIMEOUT = 45          # seconds
 PAGE_SIZE = 500       # 100..1000
-RATE_MIN_INTERVAL = 2.2
-_LAST_CALL_T = 0.0
+CF_FIRST_YEAR = 2010  # no contest predates Codeforces itself
+CACHE_DIR = Path.home() / ".cache" / "cf_pick"
+CACHE_TTL = 6 * 3600  # contest list / problemset change at most daily
+REFRESH = False       # --refresh: bypass on-disk caches
+RATE_MAX_BURST = 5    # CF allows 5 requests per rolling second
+RATE_WINDOW = 1.0     # seconds
+_LAST_CALLS = collections.deque([0.0] * RATE_MAX_BURST, maxlen=RATE_MAX_BURST)
 
 S = requests.Session()
+# Pooled keep-alive connections across both API hosts; cf_get does its own
+# retries, so the adapter-level urllib3 retry stays off.
+S.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                max_retries=Retry(total=0)))
 S.headers.update({
     "User-Agent": "cf-picker/1.4 (+no-key-required)",
     "Accept": "application/json",
+    "Connection": "keep-alive",
 })
 
+_THROTTLE_LOCK = threading.Lock()
+
 def _throttle(verbose=False):
-    global _LAST_CALL_T
-    now = time.monotonic()
-    wait = RATE_MIN_INTERVAL - (now - _LAST_CALL_T)
-    if wait > 0:
-        if verbose:
-            print(f"[throttle] sleeping {wait:.2f}s", file=sys.stderr)
-        time.sleep(wait)
-    _LAST_CALL_T = time.monotonic()
+    """Sliding-window limiter: at most RATE_MAX_BURST calls per RATE_WINDOW.
+
+    Bursts pass through immediately; only sustained traffic is delayed.
+    Lock-guarded so thread-pool workers share the same window.
+    """
+    with _THROTTLE_LOCK:
+        now = time.monotonic()
+        next_valid = max(now, _LAST_CALLS[0] + RATE_WINDOW)
+        _LAST_CALLS.append(next_valid)
+        wait = next_valid - now
+        if wait > 0:
+            if verbose:
+                print(f"[throttle] sleeping {wait:.2f}s", file=sys.stderr)
+            time.sleep(wait)
+
+_ASYNC_THROTTLE_LOCK = None  # created lazily so it binds to the running loop
+
+async def _throttle_async(verbose=False):
+    """Async twin of _throttle; all coroutines share the same window."""
+    global _ASYNC_THROTTLE_LOCK
+    if _ASYNC_THROTTLE_LOCK is None:
+        _ASYNC_THROTTLE_LOCK = asyncio.Lock()
+    async with _ASYNC_THROTTLE_LOCK:
+        now = time.monotonic()
+        next_valid = max(now, _LAST_CALLS[0] + RATE_WINDOW)
+        _LAST_CALLS.append(next_valid)
+        wait = next_valid - now
+        if wait > 0:
+            if verbose:
+                print(f"[throttle] sleeping {wait:.2f}s", file=sys.stderr)
+            await asyncio.sleep(wait)
 
 def die(msg: str, code: int = 1):
     print(f"Error: {msg}", file=sys.stderr)
@@ -45,9 +89,10 @@ def attach_cookie_file(path, verbose=False):
     if verbose:
         print(f"[cookies] loaded {len(jar)} cookies", file=sys.stderr)
 
-def _looks_like_html(text: str) -> bool:
-    t = (text or "").lstrip().lower()
-    return t.startswith("<!doctype html") or t.startswith("<html")
+def _looks_like_html(body: bytes) -> bool:
+    # Sniff raw bytes so the (possibly multi-MB) body is never str-decoded.
+    t = (body or b"")[:256].lstrip().lower()
+    return t.startswith((b"<!doctype html", b"<html"))
 
 def cf_get(path, params=None, retries=4, backoff=0.5, timeout=None, verbose=False):
     """GET wrapper: global throttle, multi-host retry, WAF/HTML detection."""
@@ -61,9 +106,9 @@ def cf_get(path, params=None, retries=4, backoff=0.5, timeout=None, verbose=Fals
             try:
                 r = S.get(url, params=params, timeout=timeout, allow_redirects=True)
                 ctype = (r.headers.get("content-type") or "").lower()
-                if "application/json" not in ctype and _looks_like_html(r.text):
+                if "application/json" not in ctype and _looks_like_html(r.content):
                     raise RuntimeError("Non-JSON HTML from CF (likely WAF/challenge).")
-                j = r.json()
+                j = orjson.loads(r.content)
                 if j.get("status") == "OK":
                     return j["result"]
                 comment = (j.get("comment") or "").strip()
@@ -72,7 +117,7 @@ def cf_get(path, params=None, retries=4, backoff=0.5, timeout=None, verbose=Fals
                 ))
                 if not transient:
                     raise RuntimeError(f"{path}: {comment or 'FAILED'}")
-            except (requests.RequestException, json.JSONDecodeError, RuntimeError) as e:
+            except (requests.RequestException, orjson.JSONDecodeError, RuntimeError) as e:
                 last_err = e
                 if verbose:
                     print(f"[cf_get] {path} host={base} try {i+1}/{retries}: {e}", file=sys.stderr)
@@ -80,47 +125,243 @@ def cf_get(path, params=None, retries=4, backoff=0.5, timeout=None, verbose=Fals
         time.sleep(backoff * (2 ** i))
     raise RuntimeError(f"{path}: exhausted retries; last error: {last_err}")
 
-def load_user_attempted(handles, verbose=False, max_pages_per_user=None):
-    """Set of (contestId, index) with any submission by ANY given user."""
-    attempted = set()
-    for h in handles:
+def _cached_cf_get(path, params=None, ttl=CACHE_TTL, verbose=False):
+    """cf_get with an on-disk JSON cache keyed by (path, params), mtime-TTL'd."""
+    key = hashlib.sha256(
+        json.dumps([path, sorted((params or {}).items())]).encode("utf-8")
+    ).hexdigest()
+    fpath = CACHE_DIR / f"{key}.json"
+    if not REFRESH:
+        try:
+            if time.time() - fpath.stat().st_mtime < ttl:
+                result = orjson.loads(fpath.read_bytes())
+                if verbose:
+                    print(f"[cache] {path}: hit ({fpath.name})", file=sys.stderr)
+                return result
+        except (OSError, orjson.JSONDecodeError):
+            pass  # missing/stale/corrupt cache -> refetch
+    result = cf_get(path, params, verbose=verbose)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fpath.write_bytes(orjson.dumps(result))
+    except OSError as e:
         if verbose:
-            print(f"[user.status] {h}", file=sys.stderr)
-        start = 1
-        page = 0
-        while True:
-            page += 1
-            if verbose:
-                print(f"[user.status] {h} page={page} from={start}", file=sys.stderr)
+            print(f"[cache] {path}: write failed: {e}", file=sys.stderr)
+    return result
+
+async def cf_get_async(client, path, params=None, retries=4, backoff=0.5, verbose=False):
+    """Async GET wrapper: global throttle, multi-host retry, WAF/HTML detection."""
+    last_err = None
+    for i in range(retries):
+        await _throttle_async(verbose=verbose)
+        for base in API_HOSTS:
+            url = f"{base}/{path}"
             try:
-                batch = cf_get("user.status", {
-                    "handle": h, "from": start, "count": PAGE_SIZE
-                }, verbose=verbose)
-            except Exception as e:
-                msg = str(e)
-                if "not found" in msg.lower() or "handles:" in msg.lower():
-                    die(f"Handle '{h}' is invalid: {msg}")
-                raise
-            if not batch:
-                break
-            for sub in batch:
-                p = sub.get("problem", {})
-                cid, idx = p.get("contestId"), p.get("index")
-                if cid and idx:
-                    attempted.add((cid, idx))
-            if len(batch) < PAGE_SIZE:
-                break
-            if max_pages_per_user and page >= max_pages_per_user:
+                r = await client.get(url, params=params, follow_redirects=True)
+                ctype = (r.headers.get("content-type") or "").lower()
+                if "application/json" not in ctype and _looks_like_html(r.content):
+                    raise RuntimeError("Non-JSON HTML from CF (likely WAF/challenge).")
+                j = orjson.loads(r.content)
+                if j.get("status") == "OK":
+                    return j["result"]
+                comment = (j.get("comment") or "").strip()
+                transient = any(x in comment.lower() for x in (
+                    "limit exceeded", "service unavailable", "please try again later"
+                ))
+                if not transient:
+                    raise RuntimeError(f"{path}: {comment or 'FAILED'}")
+            except (httpx.HTTPError, orjson.JSONDecodeError, RuntimeError) as e:
+                last_err = e
                 if verbose:
-                    print(f"[user.status] {h} reached max_pages_per_user={max_pages_per_user}", file=sys.stderr)
+                    print(f"[cf_get] {path} host={base} try {i+1}/{retries}: {e}", file=sys.stderr)
+                continue
+        await asyncio.sleep(backoff * (2 ** i))
+    raise RuntimeError(f"{path}: exhausted retries; last error: {last_err}")
+
+def _pack_key(cid, idx):
+    """Pack (contestId, index) into one int for cheap set membership.
+
+    CF problem indices are at most a few chars ("A", "B2", ...), so the
+    index bytes fit the low 32 bits with the contest id above them.
+    """
+    h = 0
+    for ch in idx:
+        h = (h << 8) | (ord(ch) & 0xFF)
+    return (cid << 32) | (h & 0xFFFFFFFF)
+
+def _unpack_key(key):
+    """Inverse of _pack_key; used for cache files and error reporting."""
+    cid, h = key >> 32, key & 0xFFFFFFFF
+    chars = []
+    while h:
+        chars.append(chr(h & 0xFF))
+        h >>= 8
+    return cid, "".join(reversed(chars))
+
+def _read_attempted_cache(h):
+    """Return (max_id, packed keys) persisted for a handle, or (0, empty set)."""
+    try:
+        cached = orjson.loads((CACHE_DIR / f"attempted_{h}.json").read_bytes())
+        max_id = int(cached.get("max_id", 0))
+        pairs = {_pack_key(cid, idx) for cid, idx in cached.get("pairs", [])}
+        return max_id, pairs
+    except (OSError, orjson.JSONDecodeError, TypeError, ValueError):
+        return 0, set()
+
+def _write_attempted_cache(h, max_id, pairs, verbose=False):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (CACHE_DIR / f"attempted_{h}.json").write_bytes(
+            orjson.dumps({"max_id": max_id,
+                          "pairs": sorted(_unpack_key(k) for k in pairs)})
+        )
+    except OSError as e:
+        if verbose:
+            print(f"[cache] attempted_{h}: write failed: {e}", file=sys.stderr)
+
+async def _load_handle_attempted(client, h, attempted, verbose=False, max_pages_per_user=None):
+    """Page through one handle's user.status, adding packed (contestId, index) keys.
+
+    Submission ids in user.status are monotonically decreasing, so paging
+    stops as soon as a previously-seen id shows up; the cursor and pairs
+    are persisted per handle under CACHE_DIR.
+    """
+    if verbose:
+        print(f"[user.status] {h}", file=sys.stderr)
+    cached_max_id, pairs = (0, set()) if REFRESH else _read_attempted_cache(h)
+    if verbose and cached_max_id:
+        print(f"[user.status] {h} cached up to submission {cached_max_id}", file=sys.stderr)
+    max_id = cached_max_id
+    start = 1
+    page = 0
+    caught_up = False
+    complete = True
+    while not caught_up:
+        page += 1
+        if verbose:
+            print(f"[user.status] {h} page={page} from={start}", file=sys.stderr)
+        try:
+            batch = await cf_get_async(client, "user.status", {
+                "handle": h, "from": start, "count": PAGE_SIZE
+            }, verbose=verbose)
+        except Exception as e:
+            msg = str(e)
+            if "not found" in msg.lower() or "handles:" in msg.lower():
+                die(f"Handle '{h}' is invalid: {msg}")
+            raise
+        if not batch:
+            break
+        if page == 1 and batch[0].get("id"):
+            max_id = max(max_id, batch[0]["id"])
+        for sub in batch:
+            if cached_max_id and (sub.get("id") or 0) <= cached_max_id:
+                caught_up = True
                 break
-            start += PAGE_SIZE
-            time.sleep(0.2)  # small courtesy pause
+            p = sub.get("problem", {})
+            cid, idx = p.get("contestId"), p.get("index")
+            if cid and idx:
+                pairs.add(_pack_key(cid, idx))
+        if caught_up or len(batch) < PAGE_SIZE:
+            break
+        if max_pages_per_user and page >= max_pages_per_user:
+            if verbose:
+                print(f"[user.status] {h} reached max_pages_per_user={max_pages_per_user}", file=sys.stderr)
+            complete = False  # older pages were never fetched; don't trust the cursor
+            break
+        start += PAGE_SIZE
+    attempted |= pairs
+    if complete:
+        _write_attempted_cache(h, max_id, pairs, verbose=verbose)
+
+async def load_user_attempted_async(handles, verbose=False, max_pages_per_user=None):
+    """Set of packed (contestId, index) keys with any submission by ANY given user.
+
+    Handles are fetched concurrently; the shared throttle keeps the overall
+    request rate within the CF budget while pages of different users overlap.
+    """
+    attempted = set()
+    # Connection/keep-alive headers are hop-by-hop and meaningless over h2.
+    headers = {k: v for k, v in S.headers.items() if k.lower() != "connection"}
+    cookies = {c.name: c.value for c in S.cookies}
+    async with httpx.AsyncClient(http2=True, timeout=TIMEOUT,
+                                 limits=httpx.Limits(max_connections=8),
+                                 headers=headers, cookies=cookies) as client:
+        await asyncio.gather(*(
+            _load_handle_attempted(client, h, attempted,
+                                   verbose=verbose, max_pages_per_user=max_pages_per_user)
+            for h in handles
+        ))
+    return attempted
+
+def _load_handle_attempted_sync(h, verbose=False, max_pages_per_user=None):
+    """Thread-pool twin of _load_handle_attempted; returns the packed keys."""
+    if verbose:
+        print(f"[user.status] {h}", file=sys.stderr)
+    cached_max_id, pairs = (0, set()) if REFRESH else _read_attempted_cache(h)
+    if verbose and cached_max_id:
+        print(f"[user.status] {h} cached up to submission {cached_max_id}", file=sys.stderr)
+    max_id = cached_max_id
+    start = 1
+    page = 0
+    caught_up = False
+    complete = True
+    while not caught_up:
+        page += 1
+        if verbose:
+            print(f"[user.status] {h} page={page} from={start}", file=sys.stderr)
+        try:
+            batch = cf_get("user.status", {
+                "handle": h, "from": start, "count": PAGE_SIZE
+            }, verbose=verbose)
+        except Exception as e:
+            msg = str(e)
+            if "not found" in msg.lower() or "handles:" in msg.lower():
+                die(f"Handle '{h}' is invalid: {msg}")
+            raise
+        if not batch:
+            break
+        if page == 1 and batch[0].get("id"):
+            max_id = max(max_id, batch[0]["id"])
+        for sub in batch:
+            if cached_max_id and (sub.get("id") or 0) <= cached_max_id:
+                caught_up = True
+                break
+            p = sub.get("problem", {})
+            cid, idx = p.get("contestId"), p.get("index")
+            if cid and idx:
+                pairs.add(_pack_key(cid, idx))
+        if caught_up or len(batch) < PAGE_SIZE:
+            break
+        if max_pages_per_user and page >= max_pages_per_user:
+            if verbose:
+                print(f"[user.status] {h} reached max_pages_per_user={max_pages_per_user}", file=sys.stderr)
+            complete = False  # older pages were never fetched; don't trust the cursor
+            break
+        start += PAGE_SIZE
+    if complete:
+        _write_attempted_cache(h, max_id, pairs, verbose=verbose)
+    return pairs
+
+def load_user_attempted_threaded(handles, verbose=False, max_pages_per_user=None):
+    """Fallback for load_user_attempted_async when httpx is not installed.
+
+    A small thread pool over the shared requests session gives similar
+    overlap; the lock-guarded throttle keeps the combined rate in budget.
+    """
+    attempted = set()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(_load_handle_attempted_sync, h,
+                        verbose=verbose, max_pages_per_user=max_pages_per_user)
+            for h in handles
+        ]
+        for fut in futures:
+            attempted |= fut.result()
     return attempted
 
 def load_contests_meta(verbose=False):
     """Return {contestId: {'year': int, 'name': str}} for non-gym contests."""
-    contests = cf_get("contest.list", {"gym": "false"}, verbose=verbose)
+    contests = _cached_cf_get("contest.list", {"gym": "false"}, verbose=verbose)
     meta = {}
     for c in contests:
         if c.get("gym"):
@@ -141,46 +382,63 @@ def load_problemset_filtered(ratings_set, year_min, year_max,
     """
     Keep problems with rating in set AND year_min ≤ year ≤ year_max,
     excluding contests by name pattern (case-insensitive) or explicit IDs.
+    Returns {rating: [problems]} so the picker never rescans the full list.
     """
-    ps = cf_get("problemset.problems", verbose=verbose)
+    ps = _cached_cf_get("problemset.problems", verbose=verbose)
     problems = ps["problems"]
-    meta = load_contests_meta(verbose=verbose)
 
     # Build exclusion set
     excl_ids = set(int(x) for x in (exclude_contest_ids or []))
     pats = [p.lower() for p in (exclude_name_patterns or []) if p]
 
-    if pats:
-        for cid, m in meta.items():
-            name_lc = (m.get("name") or "").lower()
-            if any(p in name_lc for p in pats):
-                excl_ids.add(cid)
+    # contest.list is only needed to resolve years and names; skip the whole
+    # download when the year range covers everything and no patterns are set.
+    need_meta = bool(pats) or year_min > CF_FIRST_YEAR \
+        or year_max < datetime.now(timezone.utc).year
+    if need_meta:
+        meta = load_contests_meta(verbose=verbose)
+        if pats:
+            # One alternation regex beats |pats| substring scans per contest name.
+            rx = re.compile("|".join(re.escape(p) for p in pats))
+            for cid, m in meta.items():
+                name_lc = (m.get("name") or "").lower()
+                if rx.search(name_lc):
+                    excl_ids.add(cid)
+            if verbose:
+                print(f"[filter] exclude by name patterns {pats}: {len(excl_ids)} contests", file=sys.stderr)
+        # Pre-mark admissible contests so the hot loop does one hash lookup
+        # instead of a year-range compare plus an exclusion check.
+        ok_contests = {cid for cid, m in meta.items()
+                       if year_min <= m["year"] <= year_max and cid not in excl_ids}
+        contest_ok = ok_contests.__contains__
+    else:
         if verbose:
-            print(f"[filter] exclude by name patterns {pats}: {len(excl_ids)} contests", file=sys.stderr)
+            print("[filter] no year/name filter active; skipping contest.list", file=sys.stderr)
+        excl_in = excl_ids.__contains__
+        contest_ok = lambda cid: not excl_in(cid)
 
-    out = []
+    ratings_in = ratings_set.__contains__
+    buckets = {}
     for p in problems:
-        cid, idx, rating = p.get("contestId"), p.get("index"), p.get("rating")
-        if not cid or not idx or rating is None:
-            continue
-        if rating not in ratings_set:
-            continue
-        m = meta.get(cid)
-        if not m:
-            continue
-        if m["year"] < year_min or m["year"] > year_max:
-            continue
-        if cid in excl_ids:
-            continue
-        out.append(p)
-    return out
+        if ((cid := p.get("contestId"))
+                and p.get("index")
+                and (rating := p.get("rating")) is not None
+                and ratings_in(rating)
+                and contest_ok(cid)):
+            # Precompute once; the picker checks tag constraints per candidate.
+            # Interning dedups the lowered tag strings across ~10k problems
+            # and lets set operations short-circuit on identity.
+            p["_tags_lc"] = frozenset(sys.intern(t.lower()) for t in p.get("tags", []))
+            buckets.setdefault(rating, []).append(p)
+    return buckets
 
 def pick_strict_order(
-    candidates, attempted_set, ratings_ordered,
+    buckets_by_rating, attempted_set, ratings_ordered,
     distinct_contest=False, distinct_tags=False, tag_caps=None, seed=None
 ):
     """
     One problem per rating (order preserved), unseen by any handle.
+    Takes the pre-grouped {rating: [problems]} from load_problemset_filtered.
     - distinct_contest: forbid same contest twice
     - distinct_tags: forbid reusing *any* tag (strict: cap=1 on all tags)
     - tag_caps: dict {tag_lower: max_allowed_occurrences} (e.g., {"strings": 2})
@@ -190,12 +448,24 @@ def pick_strict_order(
 
     tag_caps = {str(k).lower(): int(v) for (k, v) in (tag_caps or {}).items() if int(v) >= 1}
 
-    fresh = [p for p in candidates if (p["contestId"], p["index"]) not in attempted_set]
+    # Filter and shuffle in one pass, and only for ratings actually
+    # requested; no intermediate "fresh" list of all candidates.
+    attempted_in = attempted_set.__contains__
     buckets = {}
-    for p in fresh:
-        buckets.setdefault(p["rating"], []).append(p)
-    for b in buckets.values():
-        random.shuffle(b)
+    for r in dict.fromkeys(ratings_ordered):  # unique ratings, order kept
+        pool = [p for p in buckets_by_rating.get(r, ())
+                if not attempted_in(_pack_key(p["contestId"], p["index"]))]
+        random.shuffle(pool)
+        buckets[r] = pool
+
+    # Feasibility check before any picking: a rating requested k times
+    # needs at least k unseen candidates, duplicates included.
+    for r, k in collections.Counter(ratings_ordered).items():
+        have = len(buckets.get(r, []))
+        if have < k:
+            raise RuntimeError(
+                f"Rating {r} is requested {k} time(s) but only {have} unseen candidate(s) exist."
+            )
 
     picked = []
     used_keys = set()
@@ -211,17 +481,40 @@ def pick_strict_order(
                 return True
         return False
 
+    def constraint_detail():
+        detail = []
+        if distinct_contest: detail.append("distinct contest")
+        if distinct_tags: detail.append("no tag repetition")
+        if tag_caps: detail.append(f"tag caps={tag_caps}")
+        return ", ".join(detail) or "none"
+
+    def saturated_tags():
+        """Tags that no further pick may carry under the current counts."""
+        return {
+            t for t, c in tag_counts.items()
+            if (distinct_tags and c >= 1) or c >= tag_caps.get(t, float("inf"))
+        }
+
     for r in ratings_ordered:
         pool = buckets.get(r, [])
+        # Cheap infeasibility pre-check: if every remaining candidate touches
+        # a saturated tag, no amount of popping will find a pick.
+        if pool and (distinct_tags or tag_caps):
+            blocked = saturated_tags()
+            if blocked and all(p["_tags_lc"] & blocked for p in pool):
+                raise RuntimeError(
+                    f"No available problem for rating {r} under constraints: "
+                    f"{constraint_detail()} (all candidates share saturated tags)."
+                )
         chosen = None
         while pool:
             cand = pool.pop()
-            key = (cand["contestId"], cand["index"])
+            key = _pack_key(cand["contestId"], cand["index"])
             if key in used_keys:
                 continue
             if distinct_contest and cand["contestId"] in used_contests:
                 continue
-            tags_lower = set(map(str.lower, cand.get("tags", [])))
+            tags_lower = cand["_tags_lc"]
             if violates_tag_rules(tags_lower):
                 continue
             chosen = cand
@@ -232,23 +525,24 @@ def pick_strict_order(
                 tag_counts[t] = tag_counts.get(t, 0) + 1
             break
         if chosen is None:
-            detail = []
-            if distinct_contest: detail.append("distinct contest")
-            if distinct_tags: detail.append("no tag repetition")
-            if tag_caps: detail.append(f"tag caps={tag_caps}")
-            raise RuntimeError(f"No available problem for rating {r} under constraints: {', '.join(detail) or 'none'}.")
+            raise RuntimeError(f"No available problem for rating {r} under constraints: {constraint_detail()}.")
         picked.append(chosen)
     return picked
 
+@functools.lru_cache(maxsize=None)
+def _url(cid, idx):
+    return f"https://codeforces.com/problemset/problem/{cid}/{idx}"
+
 def to_url(p):
-    return f"https://codeforces.com/problemset/problem/{p['contestId']}/{p['index']}"
+    return _url(p["contestId"], p["index"])
 
 def load_config(path):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
+        cfg = orjson.loads(Path(path).read_bytes())
     except Exception as e:
         die(f"Failed to read config '{path}': {e}", 2)
+    if not isinstance(cfg, dict):
+        die(f"Config '{path}' must be a JSON object.", 2)
 
     # Required
     handles = cfg.get("handles")
@@ -271,7 +565,6 @@ def load_config(path):
     seed = cfg.get("seed", None)
     prefer_v4 = bool(cfg.get("prefer_ipv4", False))
     cookie_file = cfg.get("cookie_file")
-    min_interval = float(cfg.get("min_interval", RATE_MIN_INTERVAL))
     verbose = bool(cfg.get("verbose", False))
     user_agent = cfg.get("user_agent")
     timeout = int(cfg.get("timeout", TIMEOUT))
@@ -330,7 +623,6 @@ def load_config(path):
         "seed": seed,
         "prefer_ipv4": prefer_v4,
         "cookie_file": cookie_file,
-        "min_interval": max(0.0, min_interval),
         "verbose": verbose,
         "timeout": max(5, timeout),
         "page_size": max(100, min(1000, page_size)),
@@ -341,11 +633,15 @@ def load_config(path):
     }
 
 def main():
-    global RATE_MIN_INTERVAL, TIMEOUT, API_HOSTS, PAGE_SIZE
+    global TIMEOUT, API_HOSTS, PAGE_SIZE, REFRESH
     ap = argparse.ArgumentParser(description="Pick CF problems unseen by given users, one per rating (config-driven).")
     ap.add_argument("--config", default="cf_pick.json", help="Path to JSON config (default: cf_pick.json)")
+    ap.add_argument("--refresh", action="store_true", help="Ignore on-disk caches and refetch from the API")
     args = ap.parse_args()
 
+    if args.refresh:
+        REFRESH = True
+
     cfg = load_config(args.config)
 
     if cfg["prefer_ipv4"]:
@@ -353,7 +649,6 @@ def main():
     if cfg["cookie_file"]:
         attach_cookie_file(cfg["cookie_file"], verbose=cfg["verbose"])
 
-    RATE_MIN_INTERVAL = cfg["min_interval"]
     TIMEOUT = cfg["timeout"]
     PAGE_SIZE = cfg["page_size"]
     if cfg["api_hosts"]:
@@ -363,12 +658,19 @@ def main():
     ratings_list = cfg["ratings_list"]
 
     try:
-        attempted = load_user_attempted(
-            handles,
-            verbose=cfg["verbose"],
-            max_pages_per_user=cfg["max_pages_per_user"]
-        )
-        candidates = load_problemset_filtered(
+        if httpx is not None:
+            attempted = asyncio.run(load_user_attempted_async(
+                handles,
+                verbose=cfg["verbose"],
+                max_pages_per_user=cfg["max_pages_per_user"]
+            ))
+        else:
+            attempted = load_user_attempted_threaded(
+                handles,
+                verbose=cfg["verbose"],
+                max_pages_per_user=cfg["max_pages_per_user"]
+            )
+        buckets = load_problemset_filtered(
             set(ratings_list),
             cfg["year_min"], cfg["year_max"],
             exclude_name_patterns=cfg["exclude_name_patterns"],
@@ -376,7 +678,7 @@ def main():
             verbose=cfg["verbose"]
         )
         picked = pick_strict_order(
-            candidates, attempted, ratings_list,
+            buckets, attempted, ratings_list,
             distinct_contest=cfg["distinct_contest"],
             distinct_tags=cfg["distinct_tags"],
             tag_caps=cfg["tag_caps"],